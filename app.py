@@ -2,29 +2,27 @@
 import os
 import shutil
 import logging
-import hashlib
-import time
+import secrets
 import zipfile
+import math
+import queue
+import threading
+import multiprocessing
 import streamlit as st
 from pathlib import Path
-from modules.audio_processor import extract_audio, extract_audio_clip
-from modules.transcriber import transcribe_audio
-from modules.segmenter import segment_into_sentences, filter_valid_sentences
+from typing import Optional
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait, FIRST_COMPLETED
+from modules.audio_processor import extract_audio
 from modules.anki_deck import create_anki_deck
-from modules.video_frame_extractor import VideoFrameExtractor
 from modules.cache_manager import CacheManager, cleanup_old_sessions
+from modules.pipeline import submit_with_cache, poll_with_cache, generate_cards
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-
-def generate_hash_filename(prefix: str, extension: str) -> str:
-    """Generate a random hash-based filename to avoid special characters"""
-    # Use timestamp + random component for uniqueness
-    unique_string = f"{time.time()}{os.urandom(16).hex()}"
-    hash_value = hashlib.md5(unique_string.encode()).hexdigest()
-    return f"{prefix}-{hash_value}.{extension}"
+# Number of cards shown per preview page
+PREVIEW_PAGE_SIZE = 3
 
 
 # Page config
@@ -54,14 +52,19 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# Cleanup old sessions on app startup (once per session)
-if 'cleanup_done' not in st.session_state:
+# Cleanup old sessions on app startup (once per session), in the background
+# so walking tmp/ doesn't delay the first render
+def run_cleanup():
     try:
         cleanup_old_sessions(Path("tmp"), max_age_hours=1.0)
-        st.session_state.cleanup_done = True
     except Exception as e:
         logger.error(f"Cleanup failed: {e}")
 
+
+if 'cleanup_done' not in st.session_state:
+    threading.Thread(target=run_cleanup, daemon=True).start()
+    st.session_state.cleanup_done = True
+
 # Header
 st.markdown('<h1 class="main-header">Video to Subs2srs Decks</h1>', unsafe_allow_html=True)
 st.markdown('<p class="subtitle">Convert MP4 videos to Anki flashcard decks</p>', unsafe_allow_html=True)
@@ -69,7 +72,7 @@ st.markdown('<p class="subtitle">Convert MP4 videos to Anki flashcard decks</p>'
 # Initialize session state
 if 'session_id' not in st.session_state:
     # Generate unique session ID for multi-user isolation
-    st.session_state.session_id = hashlib.md5(f"{time.time()}{os.urandom(16).hex()}".encode()).hexdigest()
+    st.session_state.session_id = secrets.token_hex(16)
 if 'processing' not in st.session_state:
     st.session_state.processing = False
 if 'completed' not in st.session_state:
@@ -88,6 +91,15 @@ if 'use_video_tags' not in st.session_state:
     st.session_state.use_video_tags = True
 
 
+@st.cache_data(max_entries=64, show_spinner=False)
+def load_media_bytes(path: str) -> Optional[bytes]:
+    """Read preview media once; clip/screenshot names are unique hashes, so the path is a stable key"""
+    try:
+        return Path(path).read_bytes()
+    except OSError:
+        return None  # Removed by session cleanup after going idle
+
+
 def process_videos(uploaded_files, api_key: str, soft_limit: int, hard_limit: int, use_video_tags: bool = True, use_cache: bool = False):
     """Main processing pipeline for multiple MP4 files"""
 
@@ -108,10 +120,8 @@ def process_videos(uploaded_files, api_key: str, soft_limit: int, hard_limit: in
         else:
             deck_name = f"Combined_{len(uploaded_files)}_videos"
 
-        all_cards = []
-        card_counter = 0
-
-        # Process each video file
+        # Prepare one job per video (uploads must be saved in this process)
+        jobs = []
         for file_idx, uploaded_file in enumerate(uploaded_files):
             # Extract filename without extension
             video_name = Path(uploaded_file.name).stem
@@ -125,95 +135,137 @@ def process_videos(uploaded_files, api_key: str, soft_limit: int, hard_limit: in
                 words = cache_mgr.words_to_objects(cached_data['words'])
                 video_path = cached_data['video_path']
                 audio_path = cached_data['audio_path']
-
-                # Re-extract audio if it was deleted
-                if not os.path.exists(audio_path):
-                    status_text.text(f"🎵 Re-extracting audio from {uploaded_file.name}...")
-                    audio_path = extract_audio(video_path, str(cache_mgr.source_dir))
-                    # Update cache with new audio path
-                    cache_mgr.save_transcript(video_name, words, video_path, audio_path)
-
-                progress = int((file_idx / len(uploaded_files)) * 50)
-                progress_bar.progress(progress)
             else:
                 # Step 1: Save uploaded MP4 file
                 status_text.text(f"📁 Saving {uploaded_file.name}...")
-                video_path = cache_mgr.source_dir / uploaded_file.name
+                video_path = str(cache_mgr.source_dir / uploaded_file.name)
                 with open(video_path, 'wb') as f:
-                    f.write(uploaded_file.read())
-
-                progress = int((file_idx / len(uploaded_files)) * 10)
-                progress_bar.progress(progress)
-
-                # Step 2: Extract audio
-                status_text.text(f"🎵 Extracting audio from {uploaded_file.name}...")
-                audio_path = extract_audio(str(video_path), str(cache_mgr.source_dir))
-
-                progress = int((file_idx / len(uploaded_files)) * 20) + 10
-                progress_bar.progress(progress)
-
-                # Step 3: Transcribe
-                status_text.text(f"🎤 Transcribing {uploaded_file.name} (this may take several minutes)...")
-                words = transcribe_audio(audio_path, api_key)
-
-                # Cache the transcript
-                cache_mgr.save_transcript(video_name, words, str(video_path), audio_path)
-
-            progress = int((file_idx / len(uploaded_files)) * 30) + 20
-            progress_bar.progress(progress)
-
-            # Step 4: Segment into sentences
-            status_text.text(f"✂️ Segmenting {uploaded_file.name} into sentences...")
-            sentences = segment_into_sentences(words, soft_limit=soft_limit, hard_limit=hard_limit)
-            valid_sentences = filter_valid_sentences(sentences)
-
-            st.info(f"📹 **{video_name}**: {len(valid_sentences)} sentences")
-
-            progress = int((file_idx / len(uploaded_files)) * 40) + 30
-            progress_bar.progress(progress)
-
-            # Step 5: Generate cards with screenshots
-            status_text.text(f"🎴 Generating cards for {uploaded_file.name}...")
-
-            # Initialize frame extractor for this video
-            frame_extractor = VideoFrameExtractor(str(video_path))
-
-            video_cards = []
-            for i, sentence in enumerate(valid_sentences):
-                # Update progress (40-80% for card generation)
-                if len(valid_sentences) > 0:
-                    sentence_progress = 40 + int(40 * (i / len(valid_sentences)))
-                    progress_bar.progress(min(sentence_progress, 80))
-
-                # Extract audio clip - use hash-based filenames to avoid special characters in Anki
-                audio_clip_filename = generate_hash_filename("audio", "mp3")
-                screenshot_filename = generate_hash_filename("image", "jpg")
-
-                audio_clip_path = str(work_dir / audio_clip_filename)
-                screenshot_path = str(work_dir / screenshot_filename)
-
-                card_counter += 1
-
-                extract_audio_clip(
-                    audio_path,
-                    sentence.start_time,
-                    sentence.end_time,
-                    audio_clip_path
+                    # Stream in 1 MiB chunks instead of loading the whole video into memory
+                    shutil.copyfileobj(uploaded_file, f, length=1024 * 1024)
+                words = None
+                audio_path = None
+
+            jobs.append({
+                'video_name': video_name,
+                'video_path': video_path,
+                'audio_path': audio_path,
+                'words': words,
+                'needs_save': False
+            })
+
+        progress_bar.progress(5)
+
+        # Stage pipeline: ffmpeg work (audio extraction, card generation) runs in
+        # spawned worker processes, network-bound transcription on threads, so a
+        # video waiting on AssemblyAI never holds a CPU worker. Uploads are
+        # submitted on one pool and polled on another, so every video is queued
+        # at AssemblyAI before waiting on any of them. Card-generation
+        # progress is reported back through a queue.
+        results = [None] * len(jobs)  # Filled by video index, so upload order is kept
+        video_progress = [0] * len(jobs)
+        last_overall = 5
+        cpu_workers = min(3, os.cpu_count() or 1, len(jobs))
+        io_workers = min(8, len(jobs))
+        # Spare cores go to decoding screenshots of one video in parallel
+        frame_workers = max(1, (os.cpu_count() or 1) // cpu_workers)
+
+        with multiprocessing.Manager() as manager, ProcessPoolExecutor(
+            max_workers=cpu_workers,
+            mp_context=multiprocessing.get_context("spawn")
+        ) as cpu_executor, ThreadPoolExecutor(max_workers=io_workers) as io_executor, \
+                ThreadPoolExecutor(max_workers=len(jobs)) as poll_executor:
+            progress_queue = manager.Queue()
+            stages = {}  # future -> (stage name, video index)
+
+            def submit_cards(idx):
+                job = jobs[idx]
+                future = cpu_executor.submit(
+                    generate_cards,
+                    idx, job['video_name'], job['video_path'], job['audio_path'], job['words'],
+                    str(cache_mgr.media_dir), soft_limit, hard_limit, progress_queue, frame_workers
                 )
+                stages[future] = ('cards', idx)
 
-                # Extract screenshot at sentence start time
-                frame_extractor.extract_frame(sentence.start_time, screenshot_path)
-
-                card = {
-                    'audioFile': audio_clip_path,
-                    'imageFile': screenshot_path,
-                    'sentence': sentence.text,
-                    'video_name': video_name  # Store video name for tagging
-                }
+            for idx, job in enumerate(jobs):
+                if job['audio_path'] and os.path.exists(job['audio_path']):
+                    submit_cards(idx)
+                else:
+                    # Step 2: Extract audio (re-extract if a cached file was deleted)
+                    status_text.text(f"🎵 Extracting audio from {job['video_name']}...")
+                    future = cpu_executor.submit(extract_audio, job['video_path'], str(cache_mgr.source_dir))
+                    stages[future] = ('audio', idx)
 
-                all_cards.append(card)
-
-            # Keep source audio/video files for regeneration (cleaned up after 1 hour)
+            try:
+                while stages:
+                    done, _ = wait(stages, timeout=0.5, return_when=FIRST_COMPLETED)
+
+                    for future in done:
+                        stage, idx = stages.pop(future)
+                        job = jobs[idx]
+                        value = future.result()
+
+                        if stage == 'audio':
+                            job['audio_path'] = value
+                            job['needs_save'] = True
+                            video_progress[idx] = 10
+                            if job['words'] is None:
+                                # Step 3: Transcribe
+                                status_text.text(f"🎤 Transcribing {job['video_name']} (this may take several minutes)...")
+                                future = io_executor.submit(submit_with_cache, job['audio_path'], api_key)
+                                stages[future] = ('submit', idx)
+                            else:
+                                submit_cards(idx)
+                        elif stage == 'submit':
+                            if 'words' in value:
+                                job['words'] = value['words']
+                                video_progress[idx] = 50
+                                submit_cards(idx)
+                            else:
+                                # Polling mostly sleeps, so it has its own threads and
+                                # never delays the next upload
+                                video_progress[idx] = 20
+                                future = poll_executor.submit(poll_with_cache, value, api_key)
+                                stages[future] = ('poll', idx)
+                        elif stage == 'poll':
+                            job['words'] = value
+                            video_progress[idx] = 50
+                            submit_cards(idx)
+                        else:
+                            results[idx] = value
+                            st.info(f"📹 **{value['video_name']}**: {value['sentence_count']} sentences")
+
+                    # Drain progress messages from the workers; only the latest
+                    # message is shown, so render it once after draining
+                    latest_message = None
+                    while True:
+                        try:
+                            idx, latest_message, percent = progress_queue.get_nowait()
+                        except queue.Empty:
+                            break
+                        video_progress[idx] = max(video_progress[idx], percent)
+                    if latest_message is not None:
+                        status_text.text(latest_message)
+
+                    # Videos account for 5-90% of overall progress; each update
+                    # is a websocket message, so skip unchanged values
+                    overall = 5 + int(85 * sum(video_progress) / (100 * len(jobs)))
+                    if overall != last_overall:
+                        progress_bar.progress(overall)
+                        last_overall = overall
+            except Exception:
+                for future in stages:
+                    future.cancel()
+                raise
+
+        # Cache new transcripts and re-extracted audio paths
+        cache_mgr.save_transcripts([
+            (job['video_name'], job['words'], job['video_path'], job['audio_path'])
+            for job in jobs if job['needs_save']
+        ])
+
+        all_cards = [card for result in results for card in result['cards']]
+
+        # Keep source audio/video files for regeneration (cleaned up after 1 hour)
 
         # Create single APKG with all cards
         status_text.text("📦 Creating Anki deck package...")
@@ -243,6 +295,52 @@ def process_videos(uploaded_files, api_key: str, soft_limit: int, hard_limit: in
         raise
 
 
+@st.fragment
+def show_card_preview(result: dict):
+    """Card preview; changing page reruns only this fragment, not the whole app"""
+    # Preview cards, one page at a time so only visible media is loaded
+    st.subheader("Card Preview")
+    preview_cards = result['preview_cards']
+    page_count = max(1, math.ceil(len(preview_cards) / PREVIEW_PAGE_SIZE))
+    page = st.number_input(
+        "Preview page",
+        min_value=1,
+        max_value=page_count,
+        step=1,
+        key="preview_page"
+    )
+    page_start = (page - 1) * PREVIEW_PAGE_SIZE
+
+    for i, card in enumerate(preview_cards[page_start:page_start + PREVIEW_PAGE_SIZE], start=page_start):
+        with st.container():
+            col1, col2 = st.columns([3, 2])
+
+            with col1:
+                sentence = card['sentence']
+                display_sentence = sentence if len(sentence) <= 100 else sentence[:100] + "..."
+                st.markdown(f"**#{i+1}:** {display_sentence}")
+                if len(sentence) > 100:
+                    with st.expander("Show full sentence"):
+                        st.write(sentence)
+
+                # Display screenshot (existence recorded at generation; media can
+                # still vanish if the session is cleaned up, so load may return None)
+                image_bytes = load_media_bytes(card['imageFile']) if card.get('imageFileExists') else None
+                if image_bytes is not None:
+                    st.image(image_bytes, width=300)
+
+            with col2:
+                audio_bytes = load_media_bytes(card['audioFile'])
+                if audio_bytes is not None:
+                    st.audio(audio_bytes, format="audio/mpeg")
+
+            st.divider()
+
+    if result['card_count'] > PREVIEW_PAGE_SIZE:
+        page_end = min(page_start + PREVIEW_PAGE_SIZE, result['card_count'])
+        st.info(f"Showing cards {page_start + 1}-{page_end} of {result['card_count']} (page {page} of {page_count})")
+
+
 # Main UI
 if not st.session_state.completed:
     # Input form
@@ -315,6 +413,7 @@ if not st.session_state.completed:
                     result = process_videos(uploaded_files, api_key, soft_limit, hard_limit, use_video_tags=use_video_tags, use_cache=False)
 
                     st.session_state.result = result
+                    st.session_state.pop("preview_page", None)  # Back to page 1 (defaults to min_value)
                     st.session_state.completed = True
                     st.session_state.can_regenerate = True
                     st.session_state.last_limits = {'max_words': max_words, 'limit_type': limit_type}
@@ -331,51 +430,27 @@ else:
     result = st.session_state.result
     st.success(f"✅ Successfully generated {result['card_count']} cards in **{result['deck_name']}**!")
 
-    # Preview cards
-    st.subheader("Card Preview")
-    for i, card in enumerate(result['preview_cards'][:15]):  # Show first 15 cards
-        with st.container():
-            col1, col2 = st.columns([3, 2])
-
-            with col1:
-                sentence = card['sentence']
-                display_sentence = sentence if len(sentence) <= 100 else sentence[:100] + "..."
-                st.markdown(f"**#{i+1}:** {display_sentence}")
-                if len(sentence) > 100:
-                    with st.expander("Show full sentence"):
-                        st.write(sentence)
-
-                # Display screenshot
-                if card.get('imageFile') and os.path.exists(card['imageFile']):
-                    st.image(card['imageFile'], width=300)
-
-            with col2:
-                st.audio(card['audioFile'])
-
-            st.divider()
-
-    if result['card_count'] > 15:
-        st.info(f"Showing 15 of {result['card_count']} cards")
+    show_card_preview(result)
 
     # Download button
     st.divider()
     col1, col2 = st.columns(2)
 
     with col1:
-        with open(result['apkg_path'], 'rb') as f:
-            st.download_button(
-                label="📥 Download APKG",
-                data=f,
-                file_name=os.path.basename(result['apkg_path']),
-                mime="application/apkg",
-                use_container_width=True
-            )
+        # Deferred: the APKG is only read when the button is clicked, not on every rerun
+        st.download_button(
+            label="📥 Download APKG",
+            data=Path(result['apkg_path']).read_bytes,
+            file_name=os.path.basename(result['apkg_path']),
+            mime="application/apkg",
+            on_click="ignore",  # Downloading doesn't need a rerun
+            use_container_width=True
+        )
 
     with col2:
         if st.button("🔄 Create Another Deck", use_container_width=True):
-            # Clean up session-specific directory
-            session_dir = Path("tmp") / st.session_state.session_id
-            shutil.rmtree(session_dir, ignore_errors=True)
+            # Clean up session-specific directories (including tmpfs media)
+            CacheManager(Path("tmp") / st.session_state.session_id).cleanup()
             st.session_state.processing = False
             st.session_state.completed = False
             st.session_state.result = None
@@ -457,7 +532,7 @@ else:
                 def __init__(self, name):
                     self.name = name
 
-                def read(self):
+                def read(self, size=-1):
                     return b''  # Not used when use_cache=True
 
             fake_files = [FakeUploadedFile(f"{name}.mp4") for name in result['video_names']]
@@ -475,6 +550,9 @@ else:
                     )
 
                     st.session_state.result = new_result
+                    # The preview widget already exists this run, so reset by
+                    # dropping its key rather than assigning to it
+                    st.session_state.pop("preview_page", None)
                     st.session_state.last_limits = {'max_words': new_max_words, 'limit_type': new_limit_type}
                     st.rerun()
 
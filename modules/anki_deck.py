@@ -2,17 +2,23 @@
 import os
 import random
 import logging
+from functools import lru_cache
+from typing import Iterable
 import genanki
 
 logger = logging.getLogger(__name__)
 
+# Fixed so every deck shares one note type instead of adding a new one to
+# the user's collection on each import. Generated randomly for this project
+# (not genanki's example ID, which other note types reuse) and must never change
+SUBS2SRS_MODEL_ID = 1805064790
 
-def create_subs2srs_model():
-    """Create Anki note model for subs2srs cards"""
-    model_id = random.randrange(1 << 30, 1 << 31)
 
+@lru_cache(maxsize=1)
+def create_subs2srs_model():
+    """Create Anki note model for subs2srs cards (built once and reused)"""
     return genanki.Model(
-        model_id,
+        SUBS2SRS_MODEL_ID,
         'Subs2SRS Japanese',
         fields=[
             {'name': 'Audio'},
@@ -44,7 +50,7 @@ img {
 
 
 def create_anki_deck(
-    cards: list,
+    cards: Iterable[dict],
     deck_name: str,
     output_path: str,
     use_video_tags: bool = False
@@ -53,7 +59,9 @@ def create_anki_deck(
     Create APKG file from cards
 
     Args:
-        cards: List of card dicts with audioFile, imageFile, sentence, video_name
+        cards: Card dicts with audioFile, imageFile, sentence, video_name and
+            optionally audioBasename/imageBasename (any iterable - consumed
+            once, so a generator works)
         deck_name: Name for the deck
         output_path: Path for output APKG file
         use_video_tags: If True, tag each card with its video_name
@@ -73,26 +81,40 @@ def create_anki_deck(
     # Collect media files
     media_files = []
 
+    # Directory listings, read once per directory instead of a stat per file
+    listings = {}
+
+    def media_exists(path: str) -> bool:
+        directory, name = os.path.split(path)
+        if directory not in listings:
+            try:
+                listings[directory] = {entry.name for entry in os.scandir(directory or ".")}
+            except OSError:
+                listings[directory] = set()
+        return name in listings[directory]
+
     # Add cards
+    card_count = 0
     for card in cards:
+        card_count += 1
         audio_file = card['audioFile']
         image_file = card['imageFile']
         sentence = card['sentence']
 
-        # Get basenames for Anki references
-        audio_basename = os.path.basename(audio_file)
+        # Get basenames for Anki references (stored on the card when generated)
+        audio_basename = card.get('audioBasename') or os.path.basename(audio_file)
 
         # Handle optional image
         if image_file:
-            image_basename = os.path.basename(image_file)
+            image_basename = card.get('imageBasename') or os.path.basename(image_file)
             image_html = f'<img src="{image_basename}">'
-            if os.path.exists(image_file):
+            if media_exists(image_file):
                 media_files.append(image_file)
         else:
             image_html = ''
 
         # Add audio to media files
-        if os.path.exists(audio_file):
+        if media_exists(audio_file):
             media_files.append(audio_file)
 
         # Create note with optional tags
@@ -119,5 +141,5 @@ def create_anki_deck(
     package.media_files = media_files
     package.write_to_file(output_path)
 
-    logger.info(f"APKG created: {output_path} ({len(cards)} cards)")
+    logger.info(f"APKG created: {output_path} ({card_count} cards)")
     return output_path
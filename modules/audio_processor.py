@@ -2,6 +2,8 @@
 import os
 import subprocess
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from modules.ffmpeg_runner import run_ffmpeg
 
 logger = logging.getLogger(__name__)
 
@@ -19,7 +21,9 @@ def extract_audio(video_path: str, output_dir: str) -> str:
     """
     logger.info(f"Extracting audio from: {video_path}")
 
-    audio_path = os.path.join(output_dir, "audio.mp3")
+    # Name after the video so parallel extractions don't overwrite each other
+    video_stem = os.path.splitext(os.path.basename(video_path))[0]
+    audio_path = os.path.join(output_dir, f"{video_stem}.mp3")
 
     cmd = [
         "ffmpeg",
@@ -33,12 +37,7 @@ def extract_audio(video_path: str, output_dir: str) -> str:
     ]
 
     try:
-        subprocess.run(
-            cmd,
-            check=True,
-            capture_output=True,
-            text=True
-        )
+        run_ffmpeg(cmd)
 
         logger.info("Audio extracted successfully")
 
@@ -81,12 +80,7 @@ def extract_audio_clip(
     ]
 
     try:
-        subprocess.run(
-            cmd,
-            check=True,
-            capture_output=True,
-            text=True
-        )
+        run_ffmpeg(cmd)
     except subprocess.CalledProcessError:
         # If copy fails, try re-encoding
         cmd = [
@@ -98,11 +92,68 @@ def extract_audio_clip(
             "-y",
             output_path
         ]
-        subprocess.run(
-            cmd,
-            check=True,
-            capture_output=True,
-            text=True
-        )
+        run_ffmpeg(cmd)
 
     logger.info(f"Audio clip extracted: {output_path}")
+
+
+def extract_audio_clips_batch(
+    audio_path: str,
+    clips: list[tuple[float, float, str]],
+    padding: float = 0.25,
+    max_clips_per_call: int = 200
+) -> None:
+    """
+    Extract many audio clips with a single FFmpeg invocation
+
+    The source is demuxed once and each range is stream-copied to its own
+    output, instead of spawning one FFmpeg process per clip. Clips are split
+    into groups of max_clips_per_call to stay under open-file limits, and
+    groups run concurrently since each is an independent FFmpeg process.
+
+    Args:
+        audio_path: Source audio file
+        clips: List of (start_time, end_time, output_path) tuples in seconds
+        padding: Padding in seconds (default 0.25s)
+        max_clips_per_call: Maximum outputs per FFmpeg process (default 200)
+    """
+    groups = [clips[i:i + max_clips_per_call] for i in range(0, len(clips), max_clips_per_call)]
+    if not groups:
+        return
+
+    def run_group(group):
+        try:
+            _run_clip_batch(audio_path, group, padding, ["-c", "copy"])
+        except subprocess.CalledProcessError:
+            # If copy fails, try re-encoding (still a single process)
+            _run_clip_batch(audio_path, group, padding, ["-b:a", "128k"])
+
+    # Threads only wait on FFmpeg subprocesses, so the GIL isn't a bottleneck
+    with ThreadPoolExecutor(max_workers=min(len(groups), os.cpu_count() or 1)) as executor:
+        # list() re-raises the first failure
+        list(executor.map(run_group, groups))
+
+    logger.info(f"Audio clips extracted: {len(clips)}")
+
+
+def _run_clip_batch(
+    audio_path: str,
+    clips: list[tuple[float, float, str]],
+    padding: float,
+    codec_args: list[str]
+) -> None:
+    """Run one FFmpeg process writing one output per clip"""
+    cmd = ["ffmpeg", "-y", "-i", audio_path]
+
+    for start_time, end_time, output_path in clips:
+        padded_start = max(0, start_time - padding)
+        padded_end = end_time + padding
+        cmd += [
+            "-map", "0:a",
+            "-ss", str(padded_start),
+            "-to", str(padded_end),
+            *codec_args,
+            output_path
+        ]
+
+    run_ffmpeg(cmd)
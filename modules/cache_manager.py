@@ -1,15 +1,221 @@
 """Cache manager for transcriptions and media files"""
 import os
+import sys
 import json
 import time
+import stat
 import shutil
+import hashlib
+import tempfile
 import logging
 from pathlib import Path
 from typing import List, Dict, Optional
 from modules.transcriber import TranscriptWordData
 
+try:
+    import orjson
+except ImportError:  # Fall back to the standard library encoder
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Content-addressed transcripts shared across sessions (keyed by audio SHA-256)
+TRANSCRIPT_CACHE_DIR = Path("tmp") / "transcripts"
+TRANSCRIPT_CACHE_MAX_ENTRIES = 64
+
+# Set to 1 to always call the API (e.g. to refresh a bad transcript)
+NO_TRANSCRIPT_CACHE_ENV = "SUBS2SRS_NO_TRANSCRIPT_CACHE"
+
+# Clips and screenshots go to RAM-backed storage when there is room for them
+SHM_DIR = Path("/dev/shm")
+SHM_MIN_FREE_BYTES = 1024 ** 3
+
+# Set to a directory (e.g. another ramdisk) to override the media root
+MEDIA_ROOT_ENV = "SUBS2SRS_TMP"
+
+
+def _user_media_dir(base: Path) -> Path:
+    """Per-user directory under a shared base (e.g. /dev/shm/subs2srs-1000)"""
+    getuid = getattr(os, "getuid", None)
+    return base / (f"subs2srs-{getuid()}" if getuid else "subs2srs")
+
+
+def _is_private_dir(path: Path) -> bool:
+    """True if path is a real directory (not a symlink) owned by this user"""
+    try:
+        st = path.lstat()
+    except OSError:
+        return False
+    if not stat.S_ISDIR(st.st_mode):
+        return False
+    getuid = getattr(os, "getuid", None)
+    return getuid is None or st.st_uid == getuid()
+
+
+def _media_root_base(tmp_dir: Path = Path("tmp")) -> Path:
+    """
+    Media root to use or sweep: the env override if set, else /dev/shm
+
+    Scoped per user and per app instance (keyed by its tmp directory), so
+    sweeping orphans never touches another user's or checkout's media.
+    """
+    override = os.environ.get(MEDIA_ROOT_ENV)
+    base = Path(override) if override else SHM_DIR
+    instance = hashlib.sha256(str(Path(tmp_dir).resolve()).encode()).hexdigest()[:12]
+    return _user_media_dir(base) / instance
+
+
+def get_media_root(tmp_dir: Path = Path("tmp")) -> Optional[Path]:
+    """Return the media root (env override or tmpfs with enough free space), else None"""
+    override = os.environ.get(MEDIA_ROOT_ENV)
+    if not override:
+        if not sys.platform.startswith("linux") or not SHM_DIR.is_dir():
+            return None
+        try:
+            if shutil.disk_usage(SHM_DIR).free < SHM_MIN_FREE_BYTES:
+                return None
+        except OSError:
+            return None
+
+    # Shared bases (/dev/shm, possibly the override) are writable by others:
+    # only use a directory we created and own
+    media_root = _media_root_base(tmp_dir)
+    user_dir = media_root.parent
+    try:
+        if override:
+            user_dir.parent.mkdir(parents=True, exist_ok=True)
+        user_dir.mkdir(mode=0o700, exist_ok=True)
+    except OSError as e:
+        logger.warning(f"Cannot create media root {user_dir}: {e}")
+        return None
+    if not _is_private_dir(user_dir):
+        logger.warning(f"Not using media root {user_dir}: symlink or owned by another user")
+        return None
+    return media_root
+
+
+def _json_dumps(obj) -> bytes:
+    """Serialize to compact JSON bytes (orjson when installed)"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(',', ':')).encode()
+
+
+def _json_loads(data: bytes):
+    """Parse JSON bytes (orjson when installed)"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def words_to_dicts(words: List[TranscriptWordData]) -> List[Dict]:
+    """Convert TranscriptWordData objects to serializable dicts"""
+    return [
+        {
+            'text': w.text,
+            'start': w.start,
+            'end': w.end,
+            'speaker': w.speaker
+        }
+        for w in words
+    ]
+
+
+def dicts_to_words(words_dict: List[Dict]) -> List[TranscriptWordData]:
+    """Convert dict words back to TranscriptWordData objects"""
+    return [
+        TranscriptWordData(
+            text=w['text'],
+            start=w['start'],
+            end=w['end'],
+            speaker=w['speaker']
+        )
+        for w in words_dict
+    ]
+
+
+def file_sha256(path: str, extra: str = "") -> str:
+    """Hash a file in 1 MiB chunks without loading it into memory, plus optional extra key text"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    digest.update(extra.encode())
+    return digest.hexdigest()
+
+
+def load_cached_transcript(audio_hash: str) -> Optional[List[TranscriptWordData]]:
+    """
+    Get a transcript previously saved for identical audio
+
+    Args:
+        audio_hash: SHA-256 of the audio file
+
+    Returns:
+        List of TranscriptWordData or None if not cached
+    """
+    cache_file = TRANSCRIPT_CACHE_DIR / f"{audio_hash}.json"
+    if not cache_file.exists():
+        return None
+
+    try:
+        with open(cache_file, 'rb') as f:
+            words = dicts_to_words(_json_loads(f.read()))
+    except (ValueError, KeyError, TypeError, OSError) as e:
+        logger.warning(f"Ignoring corrupt cached transcript {audio_hash[:12]}: {e}")
+        return None
+
+    # Mark as recently used for eviction (best effort - the file may have
+    # just been evicted by another thread)
+    try:
+        os.utime(cache_file, None)
+    except OSError:
+        pass
+    logger.info(f"Using content-cached transcript {audio_hash[:12]} ({len(words)} words)")
+    return words
+
+
+def save_cached_transcript(audio_hash: str, words: List[TranscriptWordData]):
+    """
+    Save a transcript keyed by audio content, evicting the oldest entries
+
+    Args:
+        audio_hash: SHA-256 of the audio file
+        words: List of TranscriptWordData objects
+    """
+    # A failed cache write must never fail the job (the API call already succeeded)
+    try:
+        TRANSCRIPT_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        cache_file = TRANSCRIPT_CACHE_DIR / f"{audio_hash}.json"
+
+        # Write atomically so concurrent workers never see a partial file; the
+        # unique temp name keeps threads saving identical audio apart
+        fd, tmp_name = tempfile.mkstemp(dir=TRANSCRIPT_CACHE_DIR, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(_json_dumps(words_to_dicts(words)))
+            os.replace(tmp_name, cache_file)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+    except OSError as e:
+        logger.warning(f"Could not cache transcript {audio_hash[:12]}: {e}")
+        return
+
+    # Other threads may evict concurrently, so skip files that vanish
+    entries = []
+    for path in TRANSCRIPT_CACHE_DIR.glob("*.json"):
+        try:
+            entries.append((path.stat().st_mtime, path))
+        except OSError:
+            pass
+    entries.sort()
+    for _, old_file in entries[:-TRANSCRIPT_CACHE_MAX_ENTRIES]:
+        try:
+            old_file.unlink(missing_ok=True)
+        except OSError as e:
+            logger.warning(f"Could not evict cached transcript {old_file.name}: {e}")
+
 
 class CacheManager:
     """Manages transcript and media caching for regeneration"""
@@ -25,18 +231,23 @@ class CacheManager:
         self.cache_file = self.session_dir / "transcript_cache.json"
         self.activity_file = self.session_dir / "last_activity.txt"
         self.source_dir = self.session_dir / "source"
+        self._cache: Optional[Dict] = None  # Parsed cache file, loaded on first use
+
+        # Intermediate clips/screenshots live in RAM when possible
+        media_root = get_media_root(self.session_dir.parent)
+        self.media_dir = media_root / self.session_dir.name if media_root else self.session_dir
 
         # Create directories
         self.session_dir.mkdir(parents=True, exist_ok=True)
         self.source_dir.mkdir(exist_ok=True)
+        self.media_dir.mkdir(parents=True, exist_ok=True)
 
         # Update activity timestamp
         self.update_activity()
 
     def update_activity(self):
-        """Update last activity timestamp"""
-        with open(self.activity_file, 'w') as f:
-            f.write(str(time.time()))
+        """Update last activity timestamp (the activity file's mtime - one utime, no write)"""
+        self.activity_file.touch()
 
     def save_transcript(self, video_name: str, words: List[TranscriptWordData],
                        video_path: str, audio_path: str):
@@ -49,41 +260,51 @@ class CacheManager:
             video_path: Path to video file
             audio_path: Path to audio file
         """
-        # Load existing cache or create new
+        self.save_transcripts([(video_name, words, video_path, audio_path)])
+
+    def save_transcripts(self, entries: List[tuple]):
+        """
+        Save several transcripts to cache with a single cache file rewrite
+
+        Args:
+            entries: List of (video_name, words, video_path, audio_path) tuples
+        """
+        if not entries:
+            return
+
+        # Load existing cache or create new (mutated in place, then written through)
         cache = self.load_cache()
 
-        # Convert TranscriptWordData to serializable dict
-        words_dict = [
-            {
-                'text': w.text,
-                'start': w.start,
-                'end': w.end,
-                'speaker': w.speaker
+        for video_name, words, video_path, audio_path in entries:
+            # Store in cache
+            cache[video_name] = {
+                'words': words_to_dicts(words),
+                'video_path': video_path,
+                'audio_path': audio_path,
+                'timestamp': time.time()
             }
-            for w in words
-        ]
-
-        # Store in cache
-        cache[video_name] = {
-            'words': words_dict,
-            'video_path': video_path,
-            'audio_path': audio_path,
-            'timestamp': time.time()
-        }
+            logger.info(f"Cached transcript for {video_name} ({len(words)} words)")
 
-        # Save cache
-        with open(self.cache_file, 'w') as f:
-            json.dump(cache, f, indent=2)
+        # Save cache (compact - the file is machine-read only)
+        # Write atomically so a crash mid-write can't truncate the cache
+        tmp_file = self.cache_file.with_suffix(".json.tmp")
+        with open(tmp_file, 'wb') as f:
+            f.write(_json_dumps(cache))
+        os.replace(tmp_file, self.cache_file)
 
-        logger.info(f"Cached transcript for {video_name} ({len(words)} words)")
         self.update_activity()
 
     def load_cache(self) -> Dict:
-        """Load cache from file"""
-        if self.cache_file.exists():
-            with open(self.cache_file, 'r') as f:
-                return json.load(f)
-        return {}
+        """Load cache from file (parsed once per CacheManager, then kept in memory)"""
+        if self._cache is None:
+            self._cache = {}
+            if self.cache_file.exists():
+                try:
+                    with open(self.cache_file, 'rb') as f:
+                        self._cache = _json_loads(f.read())
+                except (ValueError, OSError) as e:  # JSONDecodeError is a ValueError
+                    logger.warning(f"Ignoring corrupt transcript cache {self.cache_file}: {e}")
+        return self._cache
 
     def get_transcript(self, video_name: str) -> Optional[Dict]:
         """
@@ -109,32 +330,37 @@ class CacheManager:
 
     def words_to_objects(self, words_dict: List[Dict]) -> List[TranscriptWordData]:
         """Convert dict words back to TranscriptWordData objects"""
-        return [
-            TranscriptWordData(
-                text=w['text'],
-                start=w['start'],
-                end=w['end'],
-                speaker=w['speaker']
-            )
-            for w in words_dict
-        ]
+        return dicts_to_words(words_dict)
 
     def get_age_hours(self) -> float:
         """Get age of session in hours based on last activity"""
-        if not self.activity_file.exists():
-            return 0.0
+        return session_age_hours(self.session_dir)
 
-        with open(self.activity_file, 'r') as f:
-            last_activity = float(f.read().strip())
+    def cleanup(self):
+        """Delete entire session directory and its tmpfs media directory"""
+        remove_session(self.session_dir)
 
-        age_seconds = time.time() - last_activity
-        return age_seconds / 3600  # Convert to hours
 
-    def cleanup(self):
-        """Delete entire session directory"""
-        if self.session_dir.exists():
-            shutil.rmtree(self.session_dir)
-            logger.info(f"Cleaned up session directory: {self.session_dir}")
+def session_age_hours(session_dir: Path) -> float:
+    """Hours since a session's last activity, without touching it (0.0 if unknown)"""
+    try:
+        last_activity = (Path(session_dir) / "last_activity.txt").stat().st_mtime
+    except OSError:
+        return 0.0
+
+    age_seconds = time.time() - last_activity
+    return age_seconds / 3600  # Convert to hours
+
+
+def remove_session(session_dir: Path):
+    """Delete a session directory and its tmpfs media directory"""
+    session_dir = Path(session_dir)
+    media_root = _media_root_base(session_dir.parent)
+    if _is_private_dir(media_root.parent):
+        shutil.rmtree(media_root / session_dir.name, ignore_errors=True)
+    if session_dir.exists():
+        shutil.rmtree(session_dir)
+        logger.info(f"Cleaned up session directory: {session_dir}")
 
 
 def cleanup_old_sessions(tmp_dir: Path = Path("tmp"), max_age_hours: float = 1.0):
@@ -150,19 +376,28 @@ def cleanup_old_sessions(tmp_dir: Path = Path("tmp"), max_age_hours: float = 1.0
 
     cleaned = 0
     for session_dir in tmp_dir.iterdir():
-        if not session_dir.is_dir():
+        if not session_dir.is_dir() or session_dir.resolve() == TRANSCRIPT_CACHE_DIR.resolve():
             continue
 
         try:
-            cache_mgr = CacheManager(session_dir)
-            age = cache_mgr.get_age_hours()
+            # Not via CacheManager: its constructor records activity, which
+            # would make every session look fresh
+            age = session_age_hours(session_dir)
 
             if age > max_age_hours:
-                cache_mgr.cleanup()
+                remove_session(session_dir)
                 cleaned += 1
                 logger.info(f"Cleaned up session {session_dir.name} (age: {age:.2f}h)")
         except Exception as e:
             logger.error(f"Error cleaning up {session_dir}: {e}")
 
+    # Remove tmpfs media left behind by sessions that no longer exist (only
+    # this instance's media root, so other checkouts and users are untouched)
+    media_root = _media_root_base(tmp_dir)
+    if _is_private_dir(media_root.parent) and media_root.is_dir():
+        for media_dir in media_root.iterdir():
+            if not (tmp_dir / media_dir.name).exists():
+                shutil.rmtree(media_dir, ignore_errors=True)
+
     if cleaned > 0:
         logger.info(f"Cleaned up {cleaned} old session(s)")
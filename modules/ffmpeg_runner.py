@@ -0,0 +1,60 @@
+"""Shared FFmpeg subprocess runner"""
+import subprocess
+
+# Only errors reach stderr; progress/banner output would otherwise be
+# buffered in memory for every call and thrown away
+QUIET_ARGS = ["-hide_banner", "-loglevel", "error", "-nostats"]
+
+
+def run_ffmpeg(cmd: list[str]) -> subprocess.CompletedProcess:
+    """
+    Run an FFmpeg command quietly
+
+    Args:
+        cmd: Full command line starting with "ffmpeg"
+
+    Returns:
+        subprocess.CompletedProcess: Finished process (stderr holds raw bytes)
+
+    Raises:
+        subprocess.CalledProcessError: If FFmpeg exits non-zero (stderr decoded to str)
+    """
+    try:
+        return subprocess.run(
+            [cmd[0], *QUIET_ARGS, *cmd[1:]],
+            check=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE
+        )
+    except subprocess.CalledProcessError as e:
+        # Decode only when there is an error to report
+        e.stderr = e.stderr.decode(errors="replace")
+        raise
+
+
+def open_ffmpeg(cmd: list[str], stderr_file) -> subprocess.Popen:
+    """
+    Start an FFmpeg command quietly with its output piped back
+
+    stderr goes to a file rather than a pipe: even at -loglevel error, a
+    damaged input logs a line per bad macroblock, and a full stderr pipe
+    would block FFmpeg while the caller is blocked reading stdout.
+
+    Args:
+        cmd: Full command line starting with "ffmpeg" and writing to pipe:1
+        stderr_file: Binary file (e.g. tempfile.TemporaryFile()) receiving stderr
+
+    Returns:
+        subprocess.Popen: Running process with a binary stdout pipe
+    """
+    return subprocess.Popen(
+        [cmd[0], *QUIET_ARGS, *cmd[1:]],
+        stdout=subprocess.PIPE,
+        stderr=stderr_file
+    )
+
+
+def read_stderr(stderr_file) -> str:
+    """Read back everything FFmpeg wrote to a stderr file from open_ffmpeg"""
+    stderr_file.seek(0)
+    return stderr_file.read().decode(errors="replace")
@@ -0,0 +1,176 @@
+"""Per-video processing pipeline stages
+
+Stages run in worker processes or threads, so every argument and return
+value must be picklable and nothing here may touch Streamlit.
+"""
+import os
+import json
+import secrets
+import logging
+from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from modules.audio_processor import extract_audio_clips_batch
+from modules.transcriber import (
+    submit_transcription, poll_transcription, TranscriptWordData, TRANSCRIPTION_SETTINGS
+)
+from modules.segmenter_fast import segment_into_sentences_fast
+from modules.video_frame_extractor import VideoFrameExtractor
+from modules.cache_manager import (
+    NO_TRANSCRIPT_CACHE_ENV, file_sha256, load_cached_transcript, save_cached_transcript
+)
+
+logger = logging.getLogger(__name__)
+
+
+def generate_hash_filename(prefix: str, extension: str) -> str:
+    """Generate a random hash-based filename to avoid special characters"""
+    return f"{prefix}-{secrets.token_hex(16)}.{extension}"
+
+
+def submit_with_cache(audio_path: str, api_key: str) -> dict:
+    """
+    Start transcribing audio, skipping the API if identical audio was transcribed before
+
+    Network-bound, so this runs on a thread rather than a worker process.
+    Returns as soon as the job is queued at AssemblyAI, so every upload can
+    be submitted before waiting on any of them.
+
+    Args:
+        audio_path: Path to extracted audio
+        api_key: AssemblyAI API key
+
+    Returns:
+        dict: 'words' if served from cache, else 'transcript_id' and 'audio_hash'
+            to pass to poll_with_cache
+    """
+    if os.environ.get(NO_TRANSCRIPT_CACHE_ENV) == "1":
+        return {'transcript_id': submit_transcription(audio_path, api_key), 'audio_hash': None}
+
+    # Key on the job settings too, so changing them doesn't serve stale transcripts
+    audio_hash = file_sha256(audio_path, extra=json.dumps(TRANSCRIPTION_SETTINGS, sort_keys=True))
+    words = load_cached_transcript(audio_hash)
+    if words is not None:
+        return {'words': words}
+    return {'transcript_id': submit_transcription(audio_path, api_key), 'audio_hash': audio_hash}
+
+
+def poll_with_cache(submission: dict, api_key: str) -> List[TranscriptWordData]:
+    """
+    Wait for a transcription started by submit_with_cache and cache its words
+
+    Args:
+        submission: Value returned by submit_with_cache (without 'words')
+        api_key: AssemblyAI API key
+
+    Returns:
+        list: List of TranscriptWordData objects
+    """
+    words = poll_transcription(submission['transcript_id'], api_key)
+    if submission['audio_hash'] is not None:
+        save_cached_transcript(submission['audio_hash'], words)
+    return words
+
+
+def generate_cards(
+    video_index: int,
+    video_name: str,
+    video_path: str,
+    audio_path: str,
+    words: List[TranscriptWordData],
+    work_dir: str,
+    soft_limit: int,
+    hard_limit: int,
+    progress_queue=None,
+    frame_workers: int = 1
+) -> dict:
+    """
+    Segment a transcript and build cards with audio clips and screenshots
+
+    Args:
+        video_index: Position of the video in the upload list
+        video_name: Video filename without extension
+        video_path: Path to the saved MP4 file
+        audio_path: Path to extracted audio
+        words: Transcript words
+        work_dir: Directory for audio clips and screenshots
+        soft_limit: Soft word limit for segmentation
+        hard_limit: Hard word limit for segmentation
+        progress_queue: Optional queue receiving (video_index, message, percent)
+        frame_workers: Concurrent decoders for screenshots, and their total thread budget (default 1)
+
+    Returns:
+        dict: video_index, video_name, sentence_count, cards
+    """
+    last_update = None
+
+    def report(message: str, percent: int):
+        # Each put is an IPC round-trip to the manager process, so only send
+        # when something changes (per-frame callbacks would send hundreds)
+        nonlocal last_update
+        if progress_queue is not None and (message, percent) != last_update:
+            last_update = (message, percent)
+            progress_queue.put((video_index, message, percent))
+
+    # Step 4: Segment into sentences
+    report(f"✂️ Segmenting {video_name} into sentences...", 50)
+    # Validity filtering is fused into segmentation (same rules as filter_valid_sentences)
+    valid_sentences = segment_into_sentences_fast(
+        words, soft_limit=soft_limit, hard_limit=hard_limit, valid_only=True
+    )
+
+    # Step 5: Generate cards with screenshots
+    report(f"🎴 Generating cards for {video_name}...", 55)
+
+    # Hash-based filenames avoid special characters in Anki
+    audio_clip_names = [generate_hash_filename("audio", "mp3") for _ in valid_sentences]
+    screenshot_names = [generate_hash_filename("image", "jpg") for _ in valid_sentences]
+    audio_clip_paths = [os.path.join(work_dir, name) for name in audio_clip_names]
+    screenshot_paths = [os.path.join(work_dir, name) for name in screenshot_names]
+
+    # Extract all screenshots (at sentence start time) in one decoding pass per worker
+    def update_card_progress(done, total):
+        report(f"🎴 Generating cards for {video_name}...", 55 + int(45 * done / total))
+
+    # Audio clips come from a single ffmpeg subprocess, so run it on a thread
+    # while this thread decodes screenshots
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        clips_future = executor.submit(
+            extract_audio_clips_batch,
+            audio_path,
+            [(s.start_time, s.end_time, p) for s, p in zip(valid_sentences, audio_clip_paths)]
+        )
+
+        # The with-block keeps one decoder open for single-worker extraction
+        # and any per-frame fallbacks
+        with VideoFrameExtractor(video_path, thread_budget=frame_workers) as extractor:
+            extractor.extract_frames_parallel(
+                [sentence.start_time for sentence in valid_sentences],
+                screenshot_paths,
+                progress_callback=update_card_progress,
+                workers=frame_workers
+            )
+
+        clips_future.result()
+
+    cards = [
+        {
+            'audioFile': audio_clip_paths[i],
+            'imageFile': screenshot_paths[i],
+            'audioBasename': audio_clip_names[i],  # Anki media names, known here
+            'imageBasename': screenshot_names[i],
+            'imageFileExists': True,  # extract_frames raises if a frame can't be written
+            'sentence': sentence.text,
+            'video_name': video_name  # Store video name for tagging
+        }
+        for i, sentence in enumerate(valid_sentences)
+    ]
+
+    report(f"✅ Finished {video_name}", 100)
+    logger.info(f"Generated {len(cards)} cards for {video_name}")
+
+    return {
+        'video_index': video_index,
+        'video_name': video_name,
+        'sentence_count': len(valid_sentences),
+        'cards': cards
+    }
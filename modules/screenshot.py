@@ -2,6 +2,7 @@
 import os
 import subprocess
 import logging
+from modules.ffmpeg_runner import run_ffmpeg
 
 logger = logging.getLogger(__name__)
 
@@ -33,12 +34,7 @@ def extract_screenshot(
     ]
 
     try:
-        subprocess.run(
-            cmd,
-            check=True,
-            capture_output=True,
-            text=True
-        )
+        run_ffmpeg(cmd)
         logger.info(f"Screenshot saved: {output_path}")
     except subprocess.CalledProcessError as e:
         logger.error(f"Screenshot extraction failed: {e.stderr}")
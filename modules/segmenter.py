@@ -1,20 +1,49 @@
 """Sentence segmentation"""
 import re
 import logging
-from typing import List
+from functools import cached_property
+from typing import List, Optional
 from modules.transcriber import TranscriptWordData
 
 logger = logging.getLogger(__name__)
 
+# Compiled once; used per word (and shared with modules.segmenter_fast)
+END_PUNCT_RE = re.compile(r'[。！？]')
+COMMA_RE = re.compile(r'[、]')
+PAUSE_RE = re.compile(r'[。！？、\s]')
+JAPANESE_RE = re.compile(r'[\u3040-\u309F\u30A0-\u30FF\u4E00-\u9FAF]')
+
 
 class Sentence:
-    """Sentence with timing and words"""
-    def __init__(self, words: List[TranscriptWordData]):
-        self.words = words
-        self.text = "".join(w.text for w in words)
-        self.start_time = words[0].start
-        self.end_time = words[-1].end
-        self.speaker = words[0].speaker
+    """Sentence with timing and words (a view of words[lo:hi])"""
+    def __init__(self, words: List[TranscriptWordData], lo: int = 0, hi: Optional[int] = None):
+        self._words = words
+        self._lo = lo
+        self._hi = len(words) if hi is None else hi
+
+    def __len__(self) -> int:
+        return self._hi - self._lo
+
+    @cached_property
+    def words(self) -> List[TranscriptWordData]:
+        return self._words[self._lo:self._hi]
+
+    @cached_property
+    def text(self) -> str:
+        # Joined on first use, so rejected sentences never build their text
+        return "".join(self._words[i].text for i in range(self._lo, self._hi))
+
+    @property
+    def start_time(self) -> float:
+        return self._words[self._lo].start
+
+    @property
+    def end_time(self) -> float:
+        return self._words[self._hi - 1].end
+
+    @property
+    def speaker(self) -> str:
+        return self._words[self._lo].speaker
 
 
 def segment_into_sentences(
@@ -43,50 +72,45 @@ def segment_into_sentences(
         return []
 
     sentences = []
-    current_sentence = []
-    current_speaker = words[0].speaker
+    seg_start = 0  # Index of the current sentence's first word
 
     for i, word in enumerate(words):
         next_word = words[i + 1] if i + 1 < len(words) else None
-
-        current_sentence.append(word)
+        length = i - seg_start + 1
 
         # Check if we should split
         should_split = False
 
         # Calculate duration
-        if current_sentence:
-            duration = word.end - current_sentence[0].start
+        duration = word.end - words[seg_start].start
 
         if not next_word:
             should_split = True  # End of transcript
         elif word.speaker != next_word.speaker:
             should_split = True  # Speaker change
-        elif duration >= max_duration and len(current_sentence) >= min_length:
+        elif duration >= max_duration and length >= min_length:
             should_split = True  # Exceeded max duration
-        elif re.search(r'[。！？]', word.text) and len(current_sentence) >= 5:
+        elif END_PUNCT_RE.search(word.text) and length >= 5:
             should_split = True  # Punctuation + reasonable length
-        elif re.search(r'[、]', word.text) and len(current_sentence) >= 7:
+        elif COMMA_RE.search(word.text) and length >= 7:
             should_split = True  # Comma with decent length
-        elif len(current_sentence) >= hard_limit:
+        elif length >= hard_limit:
             should_split = True  # Hard limit - always split
-        elif len(current_sentence) >= soft_limit:
+        elif length >= soft_limit:
             # Soft limit - split only if natural pause found
-            if re.search(r'[。！？、\s]', word.text):
+            if PAUSE_RE.search(word.text):
                 should_split = True
 
         if should_split:
             # Create sentence if it meets criteria
-            if len(current_sentence) >= min_length:
-                sentences.append(Sentence(current_sentence))
-            elif not next_word and current_sentence:
+            if length >= min_length:
+                sentences.append(Sentence(words, seg_start, i + 1))
+            elif not next_word:
                 # Include short final sentences
-                sentences.append(Sentence(current_sentence))
+                sentences.append(Sentence(words, seg_start, i + 1))
 
             # Reset
-            current_sentence = []
-            if next_word:
-                current_speaker = next_word.speaker
+            seg_start = i + 1
 
     logger.info(f"Created {len(sentences)} sentences")
     return sentences
@@ -106,11 +130,11 @@ def filter_valid_sentences(sentences: List[Sentence], min_length: int = 3) -> Li
     valid = []
     for sentence in sentences:
         # Must have minimum words
-        if len(sentence.words) < min_length:
+        if len(sentence) < min_length:
             continue
 
         # Must contain Japanese characters
-        if not re.search(r'[\u3040-\u309F\u30A0-\u30FF\u4E00-\u9FAF]', sentence.text):
+        if not JAPANESE_RE.search(sentence.text):
             continue
 
         valid.append(sentence)
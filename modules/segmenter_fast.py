@@ -0,0 +1,144 @@
+"""Numba-compiled sentence segmentation
+
+Same split rules as modules.segmenter.segment_into_sentences, but the
+per-word loop runs as a compiled kernel over parallel NumPy arrays.
+"""
+import logging
+from typing import List
+import numpy as np
+from modules.transcriber import TranscriptWordData
+from modules.segmenter import Sentence, END_PUNCT_RE, COMMA_RE, PAUSE_RE, JAPANESE_RE
+
+try:
+    from numba import njit
+except ImportError:  # Run the kernel as plain Python
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+logger = logging.getLogger(__name__)
+
+
+# Explicit signature compiles at import (or loads from the on-disk cache)
+# instead of on the first call
+@njit(
+    'int64[:](float64[:], float64[:], int64[:], boolean[:], boolean[:], boolean[:], '
+    'int64, int64, int64, float64)',
+    cache=True
+)
+def segment_into_sentences_njit(
+    starts: np.ndarray,
+    ends: np.ndarray,
+    speaker_ids: np.ndarray,
+    end_punct: np.ndarray,
+    comma: np.ndarray,
+    pause: np.ndarray,
+    soft_limit: int,
+    hard_limit: int,
+    min_length: int,
+    max_duration: float
+) -> np.ndarray:
+    """
+    Find sentence boundaries
+
+    Returns:
+        np.ndarray: Exclusive end index of every split, in order
+    """
+    n = starts.shape[0]
+    boundaries = np.empty(n, dtype=np.int64)
+    count = 0
+    seg_start = 0
+
+    for i in range(n):
+        length = i - seg_start + 1
+        duration = ends[i] - starts[seg_start]
+
+        if i == n - 1:
+            should_split = True  # End of transcript
+        elif speaker_ids[i] != speaker_ids[i + 1]:
+            should_split = True  # Speaker change
+        elif duration >= max_duration and length >= min_length:
+            should_split = True  # Exceeded max duration
+        elif end_punct[i] and length >= 5:
+            should_split = True  # Punctuation + reasonable length
+        elif comma[i] and length >= 7:
+            should_split = True  # Comma with decent length
+        elif length >= hard_limit:
+            should_split = True  # Hard limit - always split
+        elif length >= soft_limit and pause[i]:
+            should_split = True  # Soft limit - split only if natural pause found
+        else:
+            should_split = False
+
+        if should_split:
+            boundaries[count] = i + 1
+            count += 1
+            seg_start = i + 1
+
+    return boundaries[:count]
+
+
+def segment_into_sentences_fast(
+    words: List[TranscriptWordData],
+    soft_limit: int = 10,
+    hard_limit: int = 20,
+    min_length: int = 3,
+    max_duration: float = 8.0,
+    valid_only: bool = False
+) -> List[Sentence]:
+    """
+    Segment words into sentences using the compiled kernel
+
+    Args:
+        words: List of TranscriptWordData
+        soft_limit: Soft word limit - splits at this length when punctuation found (default 10)
+        hard_limit: Hard word limit - always splits at this length regardless of punctuation (default 20)
+        min_length: Minimum sentence length in words (default 3)
+        max_duration: Maximum sentence duration in seconds (default 8.0)
+        valid_only: Also apply filter_valid_sentences' rules (min_length words,
+            contains Japanese) while building, so rejected sentences are never created
+
+    Returns:
+        list: List of Sentence objects
+    """
+    logger.info(f"Segmenting {len(words)} words into sentences (compiled)...")
+
+    if not words:
+        return []
+
+    # Structure-of-arrays view of the transcript
+    speaker_index = {}
+    starts = np.array([w.start for w in words], dtype=np.float64)
+    ends = np.array([w.end for w in words], dtype=np.float64)
+    speaker_ids = np.array(
+        [speaker_index.setdefault(w.speaker, len(speaker_index)) for w in words],
+        dtype=np.int64
+    )
+    end_punct = np.array([END_PUNCT_RE.search(w.text) is not None for w in words])
+    comma = np.array([COMMA_RE.search(w.text) is not None for w in words])
+    pause = np.array([PAUSE_RE.search(w.text) is not None for w in words])
+
+    boundaries = segment_into_sentences_njit(
+        starts, ends, speaker_ids, end_punct, comma, pause,
+        soft_limit, hard_limit, min_length, float(max_duration)
+    )
+
+    # Build Sentence objects only for kept segments (short final sentences
+    # included unless filtering for validity)
+    sentences = []
+    seg_start = 0
+    for seg_end in boundaries:
+        seg_end = int(seg_end)
+        if valid_only:
+            keep = seg_end - seg_start >= min_length and any(
+                JAPANESE_RE.search(words[i].text) for i in range(seg_start, seg_end)
+            )
+        else:
+            keep = seg_end - seg_start >= min_length or seg_end == len(words)
+        if keep:
+            sentences.append(Sentence(words, seg_start, seg_end))
+        seg_start = seg_end
+
+    logger.info(f"Created {len(sentences)} sentences")
+    return sentences
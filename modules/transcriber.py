@@ -1,7 +1,10 @@
 """Transcription using AssemblyAI"""
 import logging
 import time
+import random
+import threading
 import requests
+from requests.adapters import HTTPAdapter
 
 logger = logging.getLogger(__name__)
 
@@ -15,6 +18,63 @@ class TranscriptWordData:
         self.speaker = speaker
 
 
+BASE_URL = "https://api.assemblyai.com/v2"
+
+# Job options; also part of the transcript cache key, so changing them
+# invalidates cached transcripts
+TRANSCRIPTION_SETTINGS = {
+    "language_code": "ja",  # Japanese
+    "speaker_labels": True,  # Speaker diarization
+    "punctuate": True,
+    "format_text": True,
+}
+
+# Seconds between status polls, growing from min to max
+POLL_INTERVAL_MIN = 1.0
+POLL_INTERVAL_MAX = 3.0
+
+# Retry policy for rate limits (429) and server errors (5xx)
+MAX_RETRIES = 5
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 30.0
+
+
+# One keep-alive session per thread (sessions aren't thread-safe), so polls
+# reuse the open TLS connection instead of handshaking every time
+_thread_local = threading.local()
+
+
+def _get_session() -> requests.Session:
+    """Return this thread's AssemblyAI session, creating it on first use"""
+    session = getattr(_thread_local, "session", None)
+    if session is None:
+        session = requests.Session()
+        session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=2))
+        _thread_local.session = session
+    return session
+
+
+def _request_with_backoff(method: str, url: str, **kwargs) -> requests.Response:
+    """
+    Send a request, retrying 429/5xx responses with exponential backoff and jitter
+
+    A file object passed as data is rewound before every attempt.
+    """
+    data = kwargs.get("data")
+    for attempt in range(MAX_RETRIES + 1):
+        if hasattr(data, "seek"):
+            data.seek(0)
+
+        response = _get_session().request(method, url, **kwargs)
+        retryable = response.status_code == 429 or 500 <= response.status_code < 600
+        if not retryable or attempt == MAX_RETRIES:
+            return response
+
+        delay = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt + random.random())
+        logger.warning(f"AssemblyAI returned {response.status_code}, retrying in {delay:.1f}s")
+        time.sleep(delay)
+
+
 def transcribe_audio(audio_path: str, api_key: str) -> list[TranscriptWordData]:
     """
     Transcribe audio using AssemblyAI REST API
@@ -27,15 +87,29 @@ def transcribe_audio(audio_path: str, api_key: str) -> list[TranscriptWordData]:
         list: List of TranscriptWordData objects
     """
     logger.info("Starting transcription with AssemblyAI...")
+    transcript_id = submit_transcription(audio_path, api_key)
+    return poll_transcription(transcript_id, api_key)
+
+
+def submit_transcription(audio_path: str, api_key: str) -> str:
+    """
+    Upload audio and start an AssemblyAI transcription job
 
-    base_url = "https://api.assemblyai.com/v2"
+    Args:
+        audio_path: Path to audio file
+        api_key: AssemblyAI API key
+
+    Returns:
+        str: Transcript ID to pass to poll_transcription
+    """
     headers = {"authorization": api_key}
 
     # Step 1: Upload the audio file
     logger.info("Uploading audio file...")
     with open(audio_path, "rb") as f:
-        upload_response = requests.post(
-            f"{base_url}/upload",
+        upload_response = _request_with_backoff(
+            "POST",
+            f"{BASE_URL}/upload",
             headers=headers,
             data=f
         )
@@ -47,14 +121,12 @@ def transcribe_audio(audio_path: str, api_key: str) -> list[TranscriptWordData]:
     logger.info("Requesting transcription...")
     transcript_request = {
         "audio_url": audio_url,
-        "language_code": "ja",  # Japanese
-        "speaker_labels": True,  # Speaker diarization
-        "punctuate": True,
-        "format_text": True,
+        **TRANSCRIPTION_SETTINGS,
     }
 
-    transcript_response = requests.post(
-        f"{base_url}/transcript",
+    transcript_response = _request_with_backoff(
+        "POST",
+        f"{BASE_URL}/transcript",
         json=transcript_request,
         headers=headers
     )
@@ -62,11 +134,29 @@ def transcribe_audio(audio_path: str, api_key: str) -> list[TranscriptWordData]:
     transcript_id = transcript_response.json()["id"]
     logger.info(f"Transcription job started: {transcript_id}")
 
+    return transcript_id
+
+
+def poll_transcription(transcript_id: str, api_key: str) -> list[TranscriptWordData]:
+    """
+    Wait for an AssemblyAI transcription job and return its words
+
+    Args:
+        transcript_id: ID returned by submit_transcription
+        api_key: AssemblyAI API key
+
+    Returns:
+        list: List of TranscriptWordData objects
+    """
+    headers = {"authorization": api_key}
+
     # Step 3: Poll for completion
     logger.info("Waiting for transcription to complete...")
+    poll_interval = POLL_INTERVAL_MIN
     while True:
-        status_response = requests.get(
-            f"{base_url}/transcript/{transcript_id}",
+        status_response = _request_with_backoff(
+            "GET",
+            f"{BASE_URL}/transcript/{transcript_id}",
             headers=headers
         )
         status_response.raise_for_status()
@@ -81,7 +171,9 @@ def transcribe_audio(audio_path: str, api_key: str) -> list[TranscriptWordData]:
             raise Exception(f"Transcription failed: {transcript_data.get('error')}")
 
         logger.info(f"Status: {status}... waiting")
-        time.sleep(3)  # Wait 3 seconds before polling again
+        time.sleep(poll_interval)
+        # Short jobs finish within a few seconds, so start fast and back off
+        poll_interval = min(poll_interval * 1.5, POLL_INTERVAL_MAX)
 
     # Extract words with timestamps
     words = []
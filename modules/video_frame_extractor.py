@@ -1,35 +1,212 @@
 """Video frame extractor using FFmpeg"""
 import os
+import shutil
+import tempfile
 import subprocess
+import queue
 import logging
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Callable, Optional
+from modules.ffmpeg_runner import run_ffmpeg, open_ffmpeg, read_stderr
+
+try:
+    import cv2
+except ImportError:  # Fall back to per-frame FFmpeg extraction
+    cv2 = None
 
 logger = logging.getLogger(__name__)
 
+# libjpeg-turbo SIMD encoder for decoded frames; needs the system libturbojpeg
+try:
+    from turbojpeg import TurboJPEG
+    _turbo_jpeg = TurboJPEG()
+except Exception:  # Package or shared library missing - use cv2.imwrite
+    _turbo_jpeg = None
+
+
+# Detected on first FFmpeg frame extraction (not at import, which every
+# spawned worker process pays) and reused afterwards
+@lru_cache(maxsize=1)
+def _hwaccel_args() -> tuple[str, ...]:
+    """
+    Return FFmpeg hardware decode args if FFmpeg was built with any hwaccel
+
+    `ffmpeg -hwaccels` lists compiled-in methods, not working hardware;
+    "-hwaccel auto" then uses one only if the device is actually present.
+    """
+    try:
+        result = subprocess.run(
+            ["ffmpeg", "-hide_banner", "-hwaccels"],
+            check=True,
+            capture_output=True,
+            text=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return ()
+
+    # First line is the "Hardware acceleration methods:" header
+    methods = [line.strip() for line in result.stdout.splitlines()[1:] if line.strip()]
+    if not methods:
+        return ()
+
+    logger.info(f"FFmpeg compiled hwaccel methods: {', '.join(methods)}")
+    # "auto" picks a working decoder and falls back to software per stream
+    return ("-hwaccel", "auto")
+
+# Frame outputs carry no audio, subtitle or data streams
+VIDEO_ONLY_ARGS = ["-an", "-sn", "-dn"]
+
+# Screenshots wider than this are downscaled before JPEG encoding; cards
+# and the preview never show them larger, and encode cost scales with pixels
+SCREENSHOT_MAX_WIDTH = 640
+SCALE_FILTER = f"scale='min({SCREENSHOT_MAX_WIDTH},iw)':-2"
+
+# Without OpenCV, batches at least this large use one FFmpeg select pass
+# instead of one FFmpeg process per frame
+FFMPEG_SELECT_MIN_FRAMES = 8
+
+# Software decoding gets about one thread per this many pixels (a 360p
+# frame); small frames gain nothing from more threads but pay for syncing
+PIXELS_PER_DECODE_THREAD = 640 * 360
+
+# Most frame numbers per select expression (each term is ~15 characters)
+FFMPEG_SELECT_MAX_FRAMES = 2000
+
+# JPEGs read from the select pipe that may wait for the writer thread
+FRAME_WRITE_QUEUE_SIZE = 8
+
+# Each parallel decoder gets at least this many frames, so short videos
+# don't pay for extra container opens and keyframe seeks
+FRAMES_PER_WORKER_MIN = 50
+
 
 class VideoFrameExtractor:
     """Extract frames from video at specific timestamps using FFmpeg"""
 
-    def __init__(self, video_path: str):
+    def __init__(self, video_path: str, cache_size: int = 64, thread_budget: Optional[int] = None):
         """
         Initialize the frame extractor
 
         Args:
             video_path: Path to the video file
+            cache_size: Number of extracted frames remembered by extract_frame
+            thread_budget: Maximum decoder threads in total (default: CPU count)
         """
         self.video_path = video_path
 
         if not os.path.exists(video_path):
             raise FileNotFoundError(f"Video file not found: {video_path}")
 
+        # LRU of frame index -> JPEG already written for that frame
+        self._cache = OrderedDict()
+        self._cache_max = cache_size
+        self._fps = None
+        self._pixels = None
+        self.thread_budget = thread_budget or os.cpu_count() or 1
+
+        # Output directories already created by this extractor
+        self._dirs_created: set[str] = set()
+
+        # Decoder kept open between __enter__ and __exit__
+        self._capture = None
+
         logger.info(f"Initialized VideoFrameExtractor with: {video_path}")
 
+    def __enter__(self):
+        """Open the decoder once for the lifetime of the with-block"""
+        if cv2 is not None and self._capture is None:
+            capture = self._open_capture()
+            if capture.isOpened():
+                self._capture = capture
+            else:
+                capture.release()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Release the decoder"""
+        self.close()
+        return False
+
+    def close(self):
+        """Release the decoder if it is open"""
+        if self._capture is not None:
+            self._capture.release()
+            self._capture = None
+
+    @property
+    def fps(self) -> float:
+        """Video frame rate (probed once, defaults to 30 if unknown)"""
+        if self._fps is None:
+            self._fps = self._probe_fps() or 30.0
+        return self._fps
+
+    def _probe_fps(self) -> Optional[float]:
+        """Read the average frame rate of the first video stream with ffprobe"""
+        cmd = [
+            "ffprobe",
+            "-v", "error",
+            "-select_streams", "v:0",
+            "-show_entries", "stream=avg_frame_rate",
+            "-of", "default=noprint_wrappers=1:nokey=1",
+            self.video_path
+        ]
+        try:
+            result = subprocess.run(cmd, check=True, capture_output=True, text=True)
+            num, _, den = result.stdout.strip().partition("/")
+            return float(num) / float(den or 1) or None
+        except (OSError, ValueError, ZeroDivisionError, subprocess.CalledProcessError):
+            return None
+
+    def decode_threads(self) -> int:
+        """Decoder thread count: scales with frame size (at least 2), capped at thread_budget"""
+        if self._pixels is None:
+            self._pixels = self._probe_pixels() or 0
+        if not self._pixels:
+            return self.thread_budget
+        return min(self.thread_budget, max(2, round(self._pixels / PIXELS_PER_DECODE_THREAD)))
+
+    def _probe_pixels(self) -> Optional[int]:
+        """Read the frame size (width * height) of the first video stream with ffprobe"""
+        cmd = [
+            "ffprobe",
+            "-v", "error",
+            "-select_streams", "v:0",
+            "-show_entries", "stream=width,height",
+            "-of", "csv=p=0",
+            self.video_path
+        ]
+        try:
+            result = subprocess.run(cmd, check=True, capture_output=True, text=True)
+            width, height = result.stdout.strip().split(",")[:2]
+            return int(width) * int(height) or None
+        except (OSError, ValueError, subprocess.CalledProcessError):
+            return None
+
+    def _ensure_dir(self, directory: str):
+        """Create an output directory once per extractor instead of on every frame"""
+        if directory and directory not in self._dirs_created:
+            os.makedirs(directory, exist_ok=True)
+            self._dirs_created.add(directory)
+
+    def _remember_frame(self, key: int, output_path: str):
+        """Record the JPEG written for a frame index, evicting the oldest entry"""
+        self._cache[key] = output_path
+        if len(self._cache) > self._cache_max:
+            self._cache.popitem(last=False)
+
     def extract_frame(self, timestamp: float, output_path: str) -> str:
         """
         Extract a single frame from video at the specified timestamp
 
         Uses nearest keyframe for efficiency. FFmpeg will seek to the nearest
         keyframe before the timestamp and then extract the closest frame.
+        Timestamps landing on a recently extracted frame are served by
+        copying that JPEG instead of decoding again, and inside a with-block
+        the open decoder is seeked instead of starting FFmpeg.
 
         Args:
             timestamp: Time in seconds to extract frame from
@@ -41,37 +218,61 @@ class VideoFrameExtractor:
         logger.info(f"Extracting frame at {timestamp:.2f}s -> {output_path}")
 
         # Create output directory if it doesn't exist
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        self._ensure_dir(os.path.dirname(output_path))
+
+        # Reuse a recently extracted JPEG of the same frame
+        key = round(timestamp * self.fps)
+        cached_path = self._cache.get(key)
+        if cached_path and os.path.exists(cached_path):
+            self._cache.move_to_end(key)
+            if cached_path != output_path:
+                shutil.copyfile(cached_path, output_path)
+            logger.debug(f"Frame served from cache: {output_path}")
+            return output_path
+
+        # Inside a with-block, seek the decoder that is already open instead
+        # of starting an FFmpeg process for each frame
+        if self._capture is not None:
+            self._capture.set(cv2.CAP_PROP_POS_MSEC, timestamp * 1000)
+            grabbed, frame = self._capture.read()
+            if grabbed:
+                _write_jpeg(frame, output_path)
+                self._remember_frame(key, output_path)
+                return output_path
 
         # FFmpeg command to extract a single frame
         # -ss: seek to timestamp (before input for faster seek to keyframe)
         # -i: input video file
         # -frames:v 1: extract only 1 frame
+        # -vf: downscale to at most SCREENSHOT_MAX_WIDTH
         # -q:v 2: JPEG quality (2 is high quality, similar to quality=85)
         # -y: overwrite output file if it exists
         cmd = [
             "ffmpeg",
+            *_hwaccel_args(),
+            "-threads", str(self.decode_threads()),
             "-ss", str(timestamp),
             "-i", self.video_path,
+            *VIDEO_ONLY_ARGS,
             "-frames:v", "1",
+            "-vf", SCALE_FILTER,
             "-q:v", "2",
             "-y",
             output_path
         ]
 
         try:
-            result = subprocess.run(
-                cmd,
-                check=True,
-                capture_output=True,
-                text=True
-            )
-
-            # Verify file was created
+            run_ffmpeg(cmd)
+
+            # Verify file was created (FFmpeg exits 0 without writing when the
+            # timestamp is past the last frame)
             if not os.path.exists(output_path):
                 raise FileNotFoundError(f"Frame extraction failed: {output_path}")
 
             logger.debug(f"Frame extracted successfully: {output_path}")
+
+            self._remember_frame(key, output_path)
+
             return output_path
 
         except subprocess.CalledProcessError as e:
@@ -81,6 +282,307 @@ class VideoFrameExtractor:
             logger.error(f"Frame extraction error: {str(e)}")
             raise
 
+    def extract_frames(self, timestamps: list[float], output_paths: list[str],
+                       progress_callback: Optional[Callable[[int, int], None]] = None,
+                       seek_threshold: float = 5.0) -> list[str]:
+        """
+        Extract frames at many timestamps in a single decoding pass
+
+        Uses the container opened by the with-block (or opens it once for
+        this call) and decodes forward through the sorted
+        timestamps, writing a JPEG whenever the decoder reaches the next
+        target. A seek is only issued when the next target is more than
+        seek_threshold seconds ahead, so dense timestamps never pay for a
+        keyframe seek and decoder flush per frame. Falls back to per-frame
+        FFmpeg extraction if OpenCV is unavailable or cannot open the video.
+
+        Args:
+            timestamps: List of timestamps in seconds (any order)
+            output_paths: Output path for each timestamp
+            progress_callback: Optional callable receiving (done, total)
+            seek_threshold: Gap in seconds above which to seek instead of decode
+
+        Returns:
+            list[str]: Paths to all extracted frames, in input order
+        """
+        if len(timestamps) != len(output_paths):
+            raise ValueError("timestamps and output_paths must have the same length")
+
+        logger.info(f"Extracting {len(timestamps)} frames in one pass")
+
+        for output_dir in {os.path.dirname(p) for p in output_paths}:
+            self._ensure_dir(output_dir)
+
+        # Reuse the decoder opened by __enter__, or open one for this call
+        capture = self._capture
+        owns_capture = capture is None
+        if owns_capture and cv2 is not None:
+            capture = self._open_capture()
+        if capture is None or not capture.isOpened():
+            if len(timestamps) >= FFMPEG_SELECT_MIN_FRAMES:
+                logger.warning("OpenCV unavailable, falling back to single-pass FFmpeg extraction")
+                return self._extract_frames_ffmpeg(timestamps, output_paths, progress_callback)
+
+            logger.warning("OpenCV unavailable, falling back to per-frame FFmpeg extraction")
+            frame_paths = []
+            for i, (timestamp, output_path) in enumerate(zip(timestamps, output_paths)):
+                frame_paths.append(self.extract_frame(timestamp, output_path))
+                if progress_callback:
+                    progress_callback(i + 1, len(timestamps))
+            return frame_paths
+
+        try:
+            fps = capture.get(cv2.CAP_PROP_FPS) or 30.0
+            half_frame = 0.5 / fps
+
+            position = None  # Time of the last grabbed frame, None after a seek
+            frame = None  # Decoded image of the last grabbed frame
+
+            order = sorted(range(len(timestamps)), key=lambda i: timestamps[i])
+            for done, idx in enumerate(order, start=1):
+                target = timestamps[idx]
+                output_path = output_paths[idx]
+
+                if position is None or target - position > seek_threshold:
+                    capture.set(cv2.CAP_PROP_POS_MSEC, target * 1000)
+                    position = None
+
+                # Decode forward until the current frame covers the target
+                grabbed = True
+                while position is None or position < target - half_frame:
+                    grabbed = capture.grab()
+                    if not grabbed:
+                        break
+                    position = capture.get(cv2.CAP_PROP_POS_MSEC) / 1000
+                    frame = None
+
+                if grabbed and frame is None:
+                    grabbed, frame = capture.retrieve()
+
+                if grabbed and frame is not None:
+                    _write_jpeg(frame, output_path)
+                else:
+                    # Past the last decodable frame - let FFmpeg try
+                    self.extract_frame(target, output_path)
+                    position = None
+
+                if progress_callback:
+                    progress_callback(done, len(timestamps))
+        finally:
+            if owns_capture:
+                capture.release()
+
+        logger.info(f"Extracted {len(output_paths)} frames successfully")
+        return list(output_paths)
+
+    def extract_frames_parallel(self, timestamps: list[float], output_paths: list[str],
+                                progress_callback: Optional[Callable[[int, int], None]] = None,
+                                workers: int = 1) -> list[str]:
+        """
+        Extract frames with several decoders, each covering a contiguous time range
+
+        The sorted timestamps are split into `workers` runs and each run is
+        decoded by its own capture on a thread (OpenCV releases the GIL while
+        decoding), so a single long video can use more than one core.
+
+        Args:
+            timestamps: List of timestamps in seconds (any order)
+            output_paths: Output path for each timestamp
+            progress_callback: Optional callable receiving (done, total)
+            workers: Number of concurrent decoders
+
+        Returns:
+            list[str]: Paths to all extracted frames, in input order
+        """
+        workers = max(1, min(workers, len(timestamps) // FRAMES_PER_WORKER_MIN))
+        if workers == 1 or cv2 is None:
+            return self.extract_frames(timestamps, output_paths, progress_callback)
+
+        order = sorted(range(len(timestamps)), key=lambda i: timestamps[i])
+        chunk_size = -(-len(order) // workers)
+        chunks = [order[i:i + chunk_size] for i in range(0, len(order), chunk_size)]
+
+        total = len(timestamps)
+        done = 0
+        lock = threading.Lock()
+
+        # Each worker opens its own decoder, so don't hold one idle for the whole pass
+        self.close()
+
+        # Probe once here rather than in every worker
+        self._fps = self.fps
+        self.decode_threads()
+
+        def on_frame(_done, _total):
+            nonlocal done
+            with lock:
+                done += 1
+                if progress_callback:
+                    progress_callback(done, total)
+
+        def run_chunk(chunk):
+            # Workers split the thread budget so decoders don't oversubscribe cores
+            extractor = VideoFrameExtractor(self.video_path, thread_budget=max(1, self.thread_budget // len(chunks)))
+            extractor._fps = self._fps
+            extractor._pixels = self._pixels
+            with extractor:
+                extractor.extract_frames(
+                    [timestamps[i] for i in chunk],
+                    [output_paths[i] for i in chunk],
+                    progress_callback=on_frame
+                )
+
+        with ThreadPoolExecutor(max_workers=len(chunks)) as executor:
+            # list() re-raises the first failure
+            list(executor.map(run_chunk, chunks))
+
+        return list(output_paths)
+
+    def _extract_frames_ffmpeg(self, timestamps: list[float], output_paths: list[str],
+                               progress_callback: Optional[Callable[[int, int], None]] = None) -> list[str]:
+        """
+        Extract many frames with one FFmpeg process using the select filter
+
+        Each timestamp is mapped to its nearest frame number; FFmpeg seeks to
+        the first wanted frame, decodes forward once and streams only the
+        selected frames as MJPEG over stdout, and each JPEG is written
+        straight to every output path that wants that frame (no staging files).
+        """
+        frame_numbers = [round(t * self.fps) for t in timestamps]
+        unique_numbers = sorted(set(frame_numbers))
+
+        wanted = {}  # frame number -> output paths
+        for n, output_path in zip(frame_numbers, output_paths):
+            wanted.setdefault(n, []).append(output_path)
+
+        done = 0
+        written = set()
+
+        # Files are written on a separate thread, so reading the pipe (and
+        # FFmpeg's decoding, which stalls while the pipe is full) never waits
+        # on disk I/O
+        write_queue = queue.Queue(maxsize=FRAME_WRITE_QUEUE_SIZE)
+        write_errors = []
+
+        def write_frames():
+            nonlocal done
+            while (item := write_queue.get()) is not None:
+                if write_errors:
+                    continue  # Keep draining so the reader never blocks
+                jpeg, paths = item
+                try:
+                    for output_path in paths:
+                        with open(output_path, 'wb') as f:
+                            f.write(jpeg)
+                        done += 1
+                        if progress_callback:
+                            progress_callback(done, len(timestamps))
+                except OSError as e:
+                    write_errors.append(e)
+
+        try:
+            writer = threading.Thread(target=write_frames, daemon=True)
+            writer.start()
+            try:
+                # Long select expressions are split so the -vf argument stays well
+                # under the OS per-argument limit
+                for start in range(0, len(unique_numbers), FFMPEG_SELECT_MAX_FRAMES):
+                    group = unique_numbers[start:start + FFMPEG_SELECT_MAX_FRAMES]
+
+                    # Input-seek to the group's first frame (keyframe seek, then
+                    # accurate decode) instead of decoding everything before it;
+                    # n then counts from that frame. Half a frame of margin keeps
+                    # rounding from dropping it.
+                    first = group[0]
+                    seek_args = ["-ss", f"{(first - 0.5) / self.fps:.6f}"] if first > 0 else []
+                    select_expr = "+".join(f"eq(n\\,{n - first})" for n in group)
+
+                    cmd = [
+                        "ffmpeg",
+                        *_hwaccel_args(),
+                        "-threads", str(self.decode_threads()),
+                        *seek_args,
+                        "-i", self.video_path,
+                        *VIDEO_ONLY_ARGS,
+                        "-vf", f"select={select_expr},{SCALE_FILTER}",
+                        "-vsync", "vfr",
+                        "-frames:v", str(len(group)),
+                        "-q:v", "2",
+                        "-f", "image2pipe",
+                        "-c:v", "mjpeg",
+                        "pipe:1"
+                    ]
+
+                    with tempfile.TemporaryFile() as stderr_file:
+                        process = open_ffmpeg(cmd, stderr_file)
+                        received = 0
+                        try:
+                            # Images arrive in frame order
+                            for n, jpeg in zip(group, _iter_jpegs(process.stdout)):
+                                write_queue.put((jpeg, wanted[n]))
+                                written.add(n)
+                                received += 1
+                        except ValueError as e:
+                            # Truncated MJPEG stream - report it with FFmpeg's own errors
+                            process.kill()
+                            process.wait()
+                            raise subprocess.CalledProcessError(
+                                process.returncode, cmd, stderr=f"{e}\n{read_stderr(stderr_file)}"
+                            ) from e
+                        except BaseException:
+                            process.kill()
+                            process.wait()
+                            raise
+                        finally:
+                            process.stdout.close()
+
+                        if process.wait() != 0:
+                            raise subprocess.CalledProcessError(
+                                process.returncode, cmd, stderr=read_stderr(stderr_file)
+                            )
+                    if received < len(group):
+                        logger.warning(f"FFmpeg returned {received} of {len(group)} selected frames")
+            finally:
+                write_queue.put(None)
+                writer.join()
+
+            if write_errors:
+                raise write_errors[0]
+
+            # Past the last frame FFmpeg produced - try a seek, and fail
+            # clearly if that can't produce the frame either
+            missing = len(unique_numbers) - len(written)
+            for timestamp, n, output_path in zip(timestamps, frame_numbers, output_paths):
+                if n not in written:
+                    try:
+                        self.extract_frame(timestamp, output_path)
+                    except Exception as e:
+                        raise Exception(
+                            f"Batch frame extraction returned {len(unique_numbers) - missing} of "
+                            f"{len(unique_numbers)} frames; frame at {timestamp:.2f}s failed: {e}"
+                        ) from e
+                    done += 1
+                    if progress_callback:
+                        progress_callback(done, len(timestamps))
+
+        except subprocess.CalledProcessError as e:
+            logger.error(f"FFmpeg batch frame extraction failed: {e.stderr}")
+            raise Exception(f"Batch frame extraction failed: {e.stderr}")
+
+        logger.info(f"Extracted {len(output_paths)} frames successfully")
+        return list(output_paths)
+
+    def _open_capture(self):
+        """Open an OpenCV capture, requesting hardware decoding when supported"""
+        if hasattr(cv2, "CAP_PROP_HW_ACCELERATION"):
+            params = [cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY]
+            if hasattr(cv2, "CAP_PROP_N_THREADS"):
+                params += [cv2.CAP_PROP_N_THREADS, self.decode_threads()]
+            capture = cv2.VideoCapture(self.video_path, cv2.CAP_FFMPEG, params)
+            if capture.isOpened():
+                return capture
+        return cv2.VideoCapture(self.video_path)
+
     def extract_frames_batch(self, timestamps: list[float], output_dir: str,
                             filename_pattern: str = "frame_{:04d}.jpg") -> list[str]:
         """
@@ -94,18 +596,59 @@ class VideoFrameExtractor:
         Returns:
             list[str]: Paths to all extracted frames
         """
-        logger.info(f"Extracting {len(timestamps)} frames")
+        output_paths = [
+            os.path.join(output_dir, filename_pattern.format(i))
+            for i in range(len(timestamps))
+        ]
+        return self.extract_frames(timestamps, output_paths)
+
+
+def _iter_jpegs(stream, chunk_size: int = 64 * 1024):
+    """
+    Split a concatenated MJPEG byte stream into JPEG images
+
+    Images are delimited by their SOI (FFD8) and EOI (FFD9) markers; FFmpeg's
+    encoder byte-stuffs 0xFF inside scan data, so EOI can't appear early.
+    """
+    buffer = bytearray()
+    search_from = 0
+    for chunk in iter(lambda: stream.read(chunk_size), b''):
+        buffer += chunk
+        while True:
+            start = buffer.find(b'\xff\xd8')
+            if start < 0:
+                # No image started yet - keep the last byte in case SOI is split
+                del buffer[:-1]
+                search_from = 0
+                break
+            if start > 0:
+                del buffer[:start]  # Drop anything before SOI
+                search_from = 0
+            end = buffer.find(b'\xff\xd9', max(2, search_from))
+            if end < 0:
+                # Resume just before the tail so a marker split across reads is found
+                search_from = max(2, len(buffer) - 1)
+                break
+            yield bytes(buffer[:end + 2])
+            del buffer[:end + 2]
+            search_from = 0
 
-        os.makedirs(output_dir, exist_ok=True)
+    if buffer.startswith(b'\xff\xd8'):
+        raise ValueError("MJPEG stream ended in the middle of a frame")
 
-        frame_paths = []
-        for i, timestamp in enumerate(timestamps):
-            output_path = os.path.join(output_dir, filename_pattern.format(i))
-            frame_path = self.extract_frame(timestamp, output_path)
-            frame_paths.append(frame_path)
 
-        logger.info(f"Extracted {len(frame_paths)} frames successfully")
-        return frame_paths
+def _write_jpeg(frame, output_path: str, quality: int = 85):
+    """Encode a decoded BGR frame as JPEG, downscaled to SCREENSHOT_MAX_WIDTH (raises OSError on failure)"""
+    height, width = frame.shape[:2]
+    if width > SCREENSHOT_MAX_WIDTH:
+        scaled_height = round(height * SCREENSHOT_MAX_WIDTH / width / 2) * 2
+        frame = cv2.resize(frame, (SCREENSHOT_MAX_WIDTH, scaled_height), interpolation=cv2.INTER_AREA)
+    if _turbo_jpeg is not None:
+        with open(output_path, 'wb') as f:
+            f.write(_turbo_jpeg.encode(frame, quality=quality))
+    elif not cv2.imwrite(output_path, frame, [cv2.IMWRITE_JPEG_QUALITY, quality]):
+        # imwrite reports failure by return value, not by raising
+        raise OSError(f"Could not write frame: {output_path}")
 
 
 def extract_frame_from_video(video_path: str, timestamp: float, output_path: str) -> str: